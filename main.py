@@ -1,12 +1,24 @@
 import pygame
 import sys
 import random
+from collections import deque
 from enum import Enum
 
+# Print debug messages for long note hits and releases
+DEBUG = False
+
 # Game Settings
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+NOTE_WIDTH = 70
+NOTE_HEIGHT = 20
+NOTE_SPAWN_Y = -50  # 이 위치에 도달하면 화면에 들어올 노트로 활성화
+MISS_DELAY_FRAMES = 180  # 화면 밖으로 나간 뒤 MISS까지 (60 FPS * 3초)
+
+# Only these events are queued by SDL; everything else is dropped
+# (the queue is still read unfiltered so events keep their arrival order)
+HANDLED_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.VIDEOEXPOSE]
 
 # Color Definitions
 BLACK = (0, 0, 0)
@@ -17,6 +29,27 @@ BLUE = (0, 0, 255)
 YELLOW = (255, 255, 0)
 GRAY = (128, 128, 128)
 
+# Note types (hot path에서는 Enum 대신 int 사용)
+NOTE_NORMAL = 0
+NOTE_LONG = 1
+
+# Judgment types
+JUDGMENT_PERFECT = 0
+JUDGMENT_GREAT = 1
+JUDGMENT_GOOD = 2
+JUDGMENT_BAD = 3
+JUDGMENT_MISS = 4
+
+# Indexed by judgment type
+SCORE_VALUES = (300, 200, 100, 50, 0)
+JUDGMENT_INFO = (
+    ("PERFECT", YELLOW),
+    ("GREAT", GREEN),
+    ("GOOD", BLUE),
+    ("BAD", RED),
+    ("MISS", RED)
+)
+
 class GameState(Enum):
     MENU = 0
     PLAYING = 1
@@ -24,23 +57,26 @@ class GameState(Enum):
     GAME_OVER = 3
 
 class JudgmentType(Enum):
-    PERFECT = 0
-    GREAT = 1
-    GOOD = 2
-    BAD = 3
-    MISS = 4
+    PERFECT = JUDGMENT_PERFECT
+    GREAT = JUDGMENT_GREAT
+    GOOD = JUDGMENT_GOOD
+    BAD = JUDGMENT_BAD
+    MISS = JUDGMENT_MISS
 
 class NoteType(Enum):
-    NORMAL = 0
-    LONG = 1
+    NORMAL = NOTE_NORMAL
+    LONG = NOTE_LONG
 
 class Note:
+    __slots__ = ("lane", "y", "hit", "dead", "type", "_rect")
+    
     def __init__(self, lane, y):
         self.lane = lane
         self.y = y
         self.hit = False
-        self.type = NoteType.NORMAL
-        self.off_screen_time = 0  # 화면 밖으로 나간 시간
+        self.dead = False  # 제거 대상 (update 끝에서 한 번에 정리)
+        self.type = NOTE_NORMAL
+        self._rect = pygame.Rect(0, 0, NOTE_WIDTH, NOTE_HEIGHT)  # draw마다 재사용
         
     def update(self, speed):
         """Move note down"""
@@ -54,31 +90,33 @@ class Note:
         """Get distance from judgment line"""
         return abs(self.y - judgment_line_y)
         
-    def is_off_screen(self, screen_height):
-        """Check if note is off screen"""
-        return self.y > screen_height + 50
-    
-    def draw(self, screen, lane, note_width=70, note_height=20):
-        """Draw normal note"""
-        rect = pygame.Rect(lane.center_x - note_width//2, 
-                         int(self.y) - note_height//2, 
-                         note_width, note_height)
-        
-        pygame.draw.rect(screen, lane.color, rect)
-        pygame.draw.rect(screen, WHITE, rect, 2)
+    def draw(self, screen, lane, blit_seq, drawn_rects):
+        """Queue normal note sprite for batched blit
+        
+        Parts drawn directly onto screen (not through blit_seq) add their
+        area to drawn_rects.
+        """
+        rect = self._rect
+        rect.x = lane.note_left_x
+        rect.y = int(self.y) - NOTE_HEIGHT//2
+        blit_seq.append((lane.note_surf, rect))
 
 class LongNote(Note):
+    __slots__ = ("length", "holding", "hold_start_time", "_body_rect", "_tail_rect")
+    
     def __init__(self, lane, y, length):
         super().__init__(lane, y)
-        self.type = NoteType.LONG
+        self.type = NOTE_LONG
         self.length = length
         self.holding = False
         self.hold_start_time = 0
+        self._body_rect = pygame.Rect(0, 0, NOTE_WIDTH, 0)
+        self._tail_rect = pygame.Rect(0, 0, NOTE_WIDTH, NOTE_HEIGHT)
         
-    def start_hold(self):
+    def start_hold(self, now_ms):
         """Start holding the long note"""
         self.holding = True
-        self.hold_start_time = pygame.time.get_ticks()
+        self.hold_start_time = now_ms
         
     def release_hold(self):
         """Release the long note hold"""
@@ -112,46 +150,60 @@ class LongNote(Note):
         """Get head distance from judgment line"""
         return abs(self.get_head_y() - judgment_line_y)
         
-    def draw(self, screen, lane, note_width=70, note_height=20):
-        """Draw long note"""
+    def draw(self, screen, lane, blit_seq, drawn_rects):
+        """Draw long note body, queue head/tail sprites for batched blit"""
+        left_x = lane.note_left_x
+        tail_y = int(self.get_tail_y())
+        
         # Long note body (테일에서 헤드까지)
-        long_rect = pygame.Rect(lane.center_x - note_width//2, 
-                              int(self.get_tail_y()), 
-                              note_width, self.length)
-        pygame.draw.rect(screen, lane.color, long_rect)
+        long_rect = self._body_rect
+        long_rect.x = left_x
+        long_rect.y = tail_y
+        long_rect.height = int(self.length)
+        drawn_rects.append(pygame.draw.rect(screen, lane.color, long_rect))
         pygame.draw.rect(screen, WHITE, long_rect, 2)
+        if self.holding:
+            pygame.draw.rect(screen, YELLOW, long_rect, 3)
         
-        # Head (start part) - 아래쪽 (판정선 근처)
-        head_rect = pygame.Rect(lane.center_x - note_width//2, 
-                              int(self.get_head_y()) - note_height//2, 
-                              note_width, note_height)
-        pygame.draw.rect(screen, WHITE, head_rect)
-        pygame.draw.rect(screen, lane.color, head_rect, 3)
+        # Head (start part) - 아래쪽 (판정선 근처), highlighted if holding
+        head_rect = self._rect
+        head_rect.x = left_x
+        head_rect.y = int(self.get_head_y()) - NOTE_HEIGHT//2
+        head_surf = lane.held_head_surf if self.holding else lane.head_surf
+        blit_seq.append((head_surf, head_rect))
         
         # Tail (end part) - 위쪽
-        tail_rect = pygame.Rect(lane.center_x - note_width//2, 
-                              int(self.get_tail_y()) - note_height//2, 
-                              note_width, note_height)
-        pygame.draw.rect(screen, WHITE, tail_rect)
-        pygame.draw.rect(screen, lane.color, tail_rect, 3)
-        
-        # Highlight if holding
-        if self.holding:
-            pygame.draw.rect(screen, YELLOW, long_rect, 3)
-            pygame.draw.rect(screen, YELLOW, head_rect, 3)
+        tail_rect = self._tail_rect
+        tail_rect.x = left_x
+        tail_rect.y = tail_y - NOTE_HEIGHT//2
+        blit_seq.append((lane.head_surf, tail_rect))
+
+def create_note_surface(fill_color, border_color, border_width):
+    """Render a note-sized sprite with a border"""
+    surf = pygame.Surface((NOTE_WIDTH, NOTE_HEIGHT))
+    surf.fill(fill_color)
+    pygame.draw.rect(surf, border_color, surf.get_rect(), border_width)
+    return surf
 
 class Lane:
-    def __init__(self, center_x, width, color):
+    def __init__(self, center_x, width, color, judgment_line_y):
         self.center_x = center_x
         self.width = width
         self.color = color
         self.is_pressed = False
         
-    def get_left_boundary(self):
-        return self.center_x - self.width // 2
-        
-    def get_right_boundary(self):
-        return self.center_x + self.width // 2
+        # Precomputed geometry
+        self.left_x = center_x - width // 2
+        self.right_x = center_x + width // 2
+        self.note_left_x = center_x - NOTE_WIDTH // 2
+        self.left_line = ((self.left_x, 0), (self.left_x, SCREEN_HEIGHT))
+        self.right_line = ((self.right_x, 0), (self.right_x, SCREEN_HEIGHT))
+        self.highlight_rect = pygame.Rect(self.left_x, judgment_line_y - 30, width, 60)
+        
+        # Pre-rendered note sprites
+        self.note_surf = create_note_surface(color, WHITE, 2)
+        self.head_surf = create_note_surface(WHITE, color, 3)
+        self.held_head_surf = create_note_surface(WHITE, YELLOW, 3)
 
 class ScoreManager:
     def __init__(self):
@@ -161,22 +213,19 @@ class ScoreManager:
         
     def add_score(self, judgment_type):
         """Add score based on judgment"""
-        score_values = {
-            JudgmentType.PERFECT: 300,
-            JudgmentType.GREAT: 200,
-            JudgmentType.GOOD: 100,
-            JudgmentType.BAD: 50,
-            JudgmentType.MISS: 0
-        }
+        self.score += SCORE_VALUES[judgment_type]
         
-        self.score += score_values[judgment_type]
-        
-        if judgment_type != JudgmentType.MISS and judgment_type != JudgmentType.BAD:
+        if judgment_type != JUDGMENT_MISS and judgment_type != JUDGMENT_BAD:
             self.combo += 1
             self.max_combo = max(self.max_combo, self.combo)
         else:
             self.combo = 0
             
+    def add_misses(self, count):
+        """Add several misses at once"""
+        self.score += SCORE_VALUES[JUDGMENT_MISS] * count
+        self.combo = 0
+            
     def reset(self):
         self.score = 0
         self.combo = 0
@@ -184,21 +233,12 @@ class ScoreManager:
 
 class JudgmentDisplay:
     def __init__(self):
-        self.text = ""
-        self.color = WHITE
+        self.last_type = None
         self.timer = 0
         
     def show_judgment(self, judgment_type):
         """Show judgment text"""
-        judgment_info = {
-            JudgmentType.PERFECT: ("PERFECT", YELLOW),
-            JudgmentType.GREAT: ("GREAT", GREEN),
-            JudgmentType.GOOD: ("GOOD", BLUE),
-            JudgmentType.BAD: ("BAD", RED),
-            JudgmentType.MISS: ("MISS", RED)
-        }
-        
-        self.text, self.color = judgment_info[judgment_type]
+        self.last_type = judgment_type
         self.timer = 30  # Show for 30 frames
         
     def update(self):
@@ -218,6 +258,34 @@ class RhythmGame:
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Rhythm Game")
         self.clock = pygame.time.Clock()
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(HANDLED_EVENTS)
+        pygame.event.clear()
+        
+        # Fonts (created once, reused every frame)
+        self.font_ui = pygame.font.Font(None, 36)
+        self.font_judgment = pygame.font.Font(None, 48)
+        self.font_title = pygame.font.Font(None, 74)
+        self.font_small = pygame.font.Font(None, 36)
+        
+        # Static menu text (rendered once)
+        self.title_surf = self.font_title.render("Rhythm Game", True, WHITE)
+        self.title_rect = self.title_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50))
+        self.start_surf = self.font_small.render("Press SPACE to start", True, WHITE)
+        self.start_rect = self.start_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
+        self.controls_surf = self.font_small.render("Controls: A, S, D, F", True, WHITE)
+        self.controls_rect = self.controls_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 100))
+        
+        # Judgment text (rendered once, indexed by judgment type)
+        self._judgment_surfs = [self.font_judgment.render(text, True, color)
+                                for text, color in JUDGMENT_INFO]
+        self._judgment_rects = [surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
+                                for surf in self._judgment_surfs]
+        
+        # Last rendered (value, surface) for the UI text
+        self._score_cache = (-1, None)
+        self._combo_cache = (-1, None)
+        self._max_combo_cache = (-1, None)
         
         self.state = GameState.MENU
         self.note_speed = 5
@@ -226,7 +294,11 @@ class RhythmGame:
         # Game components
         self.score_manager = ScoreManager()
         self.judgment_display = JudgmentDisplay()
-        self.notes = []
+        self.upcoming = deque()  # 아직 화면에 들어오지 않은 노트 (채보 좌표, 등장 순)
+        self.scroll = 0  # 게임 시작 후 스크롤된 거리
+        self.notes = []  # 화면에 활성화된 노트
+        self.notes_by_lane = [[], [], [], []]  # 레인별 노트 인덱스 (아래쪽 노트부터)
+        self._sweep = False  # 키 입력 처리에서 제거된 노트가 있으면 True
         
         # Setup lanes
         self.setup_lanes()
@@ -238,6 +310,11 @@ class RhythmGame:
         self.music_loaded = False
         self.music_playing = False
         self.game_start_time = 0
+        self.now_ms = 0
+        
+        # Rendering
+        self._full_redraw = True  # 다음 프레임에 화면 전체를 다시 그림
+        self._dirty_rects = []  # 지난 프레임에 움직이는 요소를 그린 영역
         
         self.running = True
         
@@ -250,10 +327,14 @@ class RhythmGame:
         self.lanes = []
         for i in range(4):
             center_x = lane_spacing * (i + 1)
-            self.lanes.append(Lane(center_x, lane_width, lane_colors[i]))
+            self.lanes.append(Lane(center_x, lane_width, lane_colors[i],
+                                   self.judgment_line_y))
+        
+        self.judgment_line = ((0, self.judgment_line_y), (SCREEN_WIDTH, self.judgment_line_y))
     
     def run(self):
         while self.running:
+            self.now_ms = pygame.time.get_ticks()  # 프레임 시작 시각 (프레임 내에서 공유)
             self.handle_events()
             self.update()
             self.draw()
@@ -275,6 +356,8 @@ class RhythmGame:
             elif event.type == pygame.KEYUP:
                 if self.state == GameState.PLAYING:
                     self.handle_key_up(event.key)
+            elif event.type == pygame.VIDEOEXPOSE:
+                self._full_redraw = True
     
     def handle_key_down(self, key):
         lane_index = self.get_lane_from_key(key)
@@ -301,9 +384,13 @@ class RhythmGame:
     
     def check_note_hit(self, lane_index):
         """Check note hit for the lane"""
-        for note in self.notes[:]:
-            if note.lane == lane_index and not note.hit:
-                if note.type == NoteType.NORMAL:
+        hit_top_y = self.judgment_line_y - 60
+        for note in self.notes_by_lane[lane_index]:
+            if note.y <= hit_top_y:
+                # 레인 노트는 아래쪽부터 정렬되어 있으므로 나머지는 모두 판정 범위 위쪽
+                break
+            if not note.hit and not note.dead:
+                if note.type == NOTE_NORMAL:
                     # Normal note judgment
                     if note.is_in_hit_range(self.judgment_line_y):
                         distance = note.get_distance_from_judgment_line(self.judgment_line_y)
@@ -313,10 +400,11 @@ class RhythmGame:
                         self.judgment_display.show_judgment(judgment_type)
                         
                         note.hit = True
-                        self.notes.remove(note)
+                        note.dead = True
+                        self._sweep = True
                         return
                         
-                elif note.type == NoteType.LONG:
+                elif note.type == NOTE_LONG:
                     # Long note head judgment - 헤드가 판정선에 도달했을 때만
                     head_y = note.get_head_y()
                     if abs(head_y - self.judgment_line_y) < 60:
@@ -325,48 +413,55 @@ class RhythmGame:
                         
                         # 헤드 판정은 홀드 시작만, 점수는 완료 시에
                         note.hit = True
-                        note.start_hold()
+                        note.start_hold(self.now_ms)
                         self.judgment_display.show_judgment(judgment_type)
-                        print(f"Long note hold started! Head at: {head_y}, Line at: {self.judgment_line_y}")
+                        if DEBUG:
+                            print(f"Long note hold started! Head at: {head_y}, Line at: {self.judgment_line_y}")
                         return
     
     def release_long_notes(self, lane_index):
         """Handle long note release"""
-        for note in self.notes[:]:
-            if (note.lane == lane_index and 
-                note.type == NoteType.LONG and 
-                note.holding):
+        for note in self.notes_by_lane[lane_index]:
+            if (note.type == NOTE_LONG and 
+                note.holding and not note.dead):
                 
                 # Check if tail passed judgment line
                 tail_y = note.get_tail_y()
                 if tail_y >= self.judgment_line_y + 30:
                     # Successfully completed
-                    self.score_manager.add_score(JudgmentType.GREAT)
-                    self.judgment_display.show_judgment(JudgmentType.GREAT)
-                    print("Long note completed successfully!")
+                    self.score_manager.add_score(JUDGMENT_GREAT)
+                    self.judgment_display.show_judgment(JUDGMENT_GREAT)
+                    if DEBUG:
+                        print("Long note completed successfully!")
                 else:
                     # Failed - released too early
-                    self.score_manager.add_score(JudgmentType.MISS)
-                    self.judgment_display.show_judgment(JudgmentType.MISS)
-                    print("Long note failed - released too early!")
+                    self.score_manager.add_score(JUDGMENT_MISS)
+                    self.judgment_display.show_judgment(JUDGMENT_MISS)
+                    if DEBUG:
+                        print("Long note failed - released too early!")
                 
-                self.notes.remove(note)
+                note.dead = True
+                self._sweep = True
     
     def calculate_judgment(self, distance):
         """Calculate judgment based on distance"""
         if distance < 15:
-            return JudgmentType.PERFECT
+            return JUDGMENT_PERFECT
         elif distance < 30:
-            return JudgmentType.GREAT
+            return JUDGMENT_GREAT
         elif distance < 45:
-            return JudgmentType.GOOD
+            return JUDGMENT_GOOD
         else:
-            return JudgmentType.BAD
+            return JUDGMENT_BAD
     
     def start_game(self):
         self.state = GameState.PLAYING
+        self._full_redraw = True
         self.score_manager.reset()
+        self.upcoming = deque()
+        self.scroll = 0
         self.notes = []
+        self.notes_by_lane = [[], [], [], []]
         self.keys_held = [False, False, False, False]
         for lane in self.lanes:
             lane.is_pressed = False
@@ -385,7 +480,9 @@ class RhythmGame:
     
     def load_mario_chart(self):
         """Load Super Mario themed chart - manually crafted to match the music"""
+        self.scroll = 0
         self.notes = []
+        self.notes_by_lane = [[], [], [], []]
         
         # Super Mario 테마 멜로디에 맞춘 채보
         # 시간 간격을 조정해서 음악과 싱크를 맞춤
@@ -394,200 +491,225 @@ class RhythmGame:
         beat_spacing = 150  # 비트 간격
         current_y = -300
         
+        # 레인 / 비트 위치 / 롱노트 길이 (0이면 일반 노트)를 나란히 저장
         # "Da da da da da da-da!" - 메인 멜로디 시작
-        mario_pattern = [
-            (0, current_y),
-            (0, current_y - beat_spacing),
-            (1, current_y - beat_spacing * 1.8),
-            (1, current_y - beat_spacing * 2.8),
-            (2, current_y - beat_spacing * 3.6),
-            (2, current_y - beat_spacing * 4.2),
-            (3, current_y - beat_spacing * 4.5),
-            
-            (0, current_y - beat_spacing * 5),
-            (1, current_y - beat_spacing * 5.4),
-            (2, current_y - beat_spacing * 5.8),
-            (3, current_y - beat_spacing * 6.2),
-            (2, current_y - beat_spacing * 6.8),
-            (1, current_y - beat_spacing * 7.2),
-            (0, current_y - beat_spacing * 7.8),
-            (1, current_y - beat_spacing * 8.4),
-            (2, current_y - beat_spacing * 8.7),
-            (0, current_y - beat_spacing * 9.0),
-            
-            
-        ]
+        pattern_lanes = (0, 0, 1, 1, 2, 2, 3,
+                         0, 1, 2, 3, 2, 1, 0, 1, 2, 0)
+        pattern_beats = (0, 1, 1.8, 2.8, 3.6, 4.2, 4.5,
+                         5, 5.4, 5.8, 6.2, 6.8, 7.2, 7.8, 8.4, 8.7, 9.0)
+        pattern_lengths = (0, 0, 0, 0, 0, 0, 0,
+                           0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        # 길이가 다르면 zip이 노트를 조용히 버리므로 확인
+        assert len(pattern_lanes) == len(pattern_beats) == len(pattern_lengths)
+        
+        # 비트 위치를 한 번에 y 좌표로 변환
+        pattern_ys = [current_y - beat_spacing * beat for beat in pattern_beats]
         
         # 패턴을 노트로 변환
-        for pattern in mario_pattern:
-            lane = pattern[0]
-            y_pos = pattern[1]
-            
-            if len(pattern) == 3:  # 롱노트
-                length = pattern[2]
-                note = LongNote(lane, y_pos, length)
-            else:  # 일반 노트
-                note = Note(lane, y_pos)
-            
-            self.notes.append(note)
+        chart = [LongNote(lane, y_pos, length) if length else Note(lane, y_pos)
+                 for lane, y_pos, length in zip(pattern_lanes, pattern_ys, pattern_lengths)]
+        
+        # 화면에 먼저 들어오는 (아래쪽) 노트부터 대기열에 넣음
+        chart.sort(key=lambda note: note.y, reverse=True)
+        self.upcoming = deque(chart)
         
         # 음악 시작
         if self.music_loaded:
             pygame.mixer.music.play()
             self.music_playing = True
-            self.game_start_time = pygame.time.get_ticks()
+            self.game_start_time = self.now_ms
         
-        print(f"Generated {len(self.notes)} Mario-themed notes!")
+        print(f"Generated {len(self.upcoming)} Mario-themed notes!")
     
     def update(self):
         if self.state == GameState.PLAYING:
-            # Move notes
-            for note in self.notes:
-                note.update(self.note_speed)
+            # 반복문 안에서 쓰는 속성은 지역 변수로
+            notes = self.notes
+            notes_by_lane = self.notes_by_lane
+            upcoming = self.upcoming
+            scroll = self.scroll
+            speed = self.note_speed
+            keys_held = self.keys_held
+            add_score = self.score_manager.add_score
+            show_judgment = self.judgment_display.show_judgment
+            off_screen_y = SCREEN_HEIGHT + 50
+            # 화면 밖으로 나간 첫 프레임을 1로 세어 MISS_DELAY_FRAMES번째 프레임에 MISS
+            miss_line_y = off_screen_y + (MISS_DELAY_FRAMES - 1) * speed
             
-            # Check long note completion
-            for note in self.notes[:]:
-                if (note.type == NoteType.LONG and 
-                    note.holding):
-                    
-                    # 롱노트 길이가 0이 되면 완료
-                    if note.length <= 0:
-                        if self.keys_held[note.lane]:
-                            # 성공적으로 완료
-                            self.score_manager.add_score(JudgmentType.GREAT)
-                            self.judgment_display.show_judgment(JudgmentType.GREAT)
-                            print("Long note completed successfully!")
-                        else:
-                            # 키를 놓고 있었음
-                            self.score_manager.add_score(JudgmentType.MISS)
-                            self.judgment_display.show_judgment(JudgmentType.MISS)
-                            print("Long note failed - key not held at completion!")
-                        self.notes.remove(note)
-                        continue
-                    
-                    # 홀드 중에 키를 놓았는지 확인
-                    if not self.keys_held[note.lane]:
-                        self.score_manager.add_score(JudgmentType.MISS)
-                        self.judgment_display.show_judgment(JudgmentType.MISS)
-                        print("Long note failed - key released during hold!")
-                        self.notes.remove(note)
+            # Activate notes that are about to enter the screen
+            while upcoming and upcoming[0].y + scroll >= NOTE_SPAWN_Y:
+                note = upcoming.popleft()
+                note.y += scroll
+                notes.append(note)
+                notes_by_lane[note.lane].append(note)
             
-            # Handle off-screen notes (3 second delay before MISS)
-            for note in self.notes[:]:
-                if note.type == NoteType.NORMAL:
-                    if note.is_off_screen(SCREEN_HEIGHT):
-                        if not note.hit:
-                            note.off_screen_time += 1
-                            # 3초 후 (60 FPS * 3 = 180 frames)
-                            if note.off_screen_time >= 180:
-                                self.score_manager.add_score(JudgmentType.MISS)
-                                self.judgment_display.show_judgment(JudgmentType.MISS)
-                                self.notes.remove(note)
-                        else:
-                            self.notes.remove(note)
-                elif note.type == NoteType.LONG:
+            # Move notes, check long note completion and off-screen notes in one pass
+            self.scroll = scroll + speed
+            missed = 0
+            removed = False
+            for note in notes:
+                if note.dead:
+                    continue
+                note.update(speed)
+                
+                if note.type == NOTE_NORMAL:
+                    bottom_y = note.y
+                else:
+                    if note.holding:
+                        # 롱노트 길이가 0이 되면 완료
+                        if note.length <= 0:
+                            if keys_held[note.lane]:
+                                # 성공적으로 완료
+                                add_score(JUDGMENT_GREAT)
+                                show_judgment(JUDGMENT_GREAT)
+                                if DEBUG:
+                                    print("Long note completed successfully!")
+                            else:
+                                # 키를 놓고 있었음
+                                add_score(JUDGMENT_MISS)
+                                show_judgment(JUDGMENT_MISS)
+                                if DEBUG:
+                                    print("Long note failed - key not held at completion!")
+                            note.dead = True
+                            removed = True
+                            continue
+                        
+                        # 홀드 중에 키를 놓았는지 확인
+                        if not keys_held[note.lane]:
+                            add_score(JUDGMENT_MISS)
+                            show_judgment(JUDGMENT_MISS)
+                            if DEBUG:
+                                print("Long note failed - key released during hold!")
+                            note.dead = True
+                            removed = True
+                            continue
+                    
                     # 롱노트는 테일이 화면을 벗어났을 때
-                    if note.get_tail_y() > SCREEN_HEIGHT + 50:
-                        if not note.hit:
-                            note.off_screen_time += 1
-                            # 3초 후 MISS
-                            if note.off_screen_time >= 180:
-                                self.score_manager.add_score(JudgmentType.MISS)
-                                self.judgment_display.show_judgment(JudgmentType.MISS)
-                                self.notes.remove(note)
-                        else:
-                            self.notes.remove(note)
+                    bottom_y = note.get_tail_y()
+                
+                # Off-screen notes (3 second delay before MISS)
+                if bottom_y > off_screen_y:
+                    if not note.hit:
+                        # 화면 밖에서도 같은 속도로 내려가므로 위치로 경과 시간을 판단
+                        if bottom_y > miss_line_y:
+                            missed += 1
+                            note.dead = True
+                            removed = True
+                    else:
+                        note.dead = True
+                        removed = True
+            if missed:
+                self.score_manager.add_misses(missed)
+                show_judgment(JUDGMENT_MISS)
+            
+            # Sweep removed notes in a single pass (only when a note was removed)
+            if removed or self._sweep:
+                self.notes = [note for note in notes if not note.dead]
+                self.notes_by_lane = [[note for note in lane_notes if not note.dead]
+                                      for lane_notes in notes_by_lane]
+                self._sweep = False
             
             # Update judgment display
             self.judgment_display.update()
     
     def draw(self):
-        self.screen.fill(BLACK)
-        
-        if self.state == GameState.MENU:
-            self.draw_menu()
+        if self._full_redraw:
+            # 상태 전환, 창 노출 등: 화면 전체를 다시 그림
+            self.screen.fill(BLACK)
+            if self.state == GameState.MENU:
+                self.draw_menu()
+                self._dirty_rects = []
+            elif self.state == GameState.PLAYING:
+                self._dirty_rects = self.draw_game()
+            pygame.display.flip()
+            self._full_redraw = False
         elif self.state == GameState.PLAYING:
-            self.draw_game()
-        
-        pygame.display.flip()
+            # 움직이는 요소가 있던 영역만 지우고, 바뀐 영역만 화면에 반영
+            for rect in self._dirty_rects:
+                self.screen.fill(BLACK, rect)
+            drawn_rects = self.draw_game()
+            pygame.display.update(self._dirty_rects + drawn_rects)
+            self._dirty_rects = drawn_rects
     
     def draw_menu(self):
-        font = pygame.font.Font(None, 74)
-        title = font.render("Rhythm Game", True, WHITE)
-        title_rect = title.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50))
-        self.screen.blit(title, title_rect)
-        
-        font_small = pygame.font.Font(None, 36)
-        start_text = font_small.render("Press SPACE to start", True, WHITE)
-        start_rect = start_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
-        self.screen.blit(start_text, start_rect)
-        
-        controls = font_small.render("Controls: A, S, D, F", True, WHITE)
-        controls_rect = controls.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 100))
-        self.screen.blit(controls, controls_rect)
+        self.screen.blit(self.title_surf, self.title_rect)
+        self.screen.blit(self.start_surf, self.start_rect)
+        self.screen.blit(self.controls_surf, self.controls_rect)
     
     def draw_game(self):
+        """Draw game screen, return the areas of the moving elements"""
         # Draw lanes
-        self.draw_lanes()
+        drawn_rects = self.draw_lanes()
         
         # Draw judgment line
-        pygame.draw.line(self.screen, RED, (0, self.judgment_line_y), 
-                        (SCREEN_WIDTH, self.judgment_line_y), 4)
+        pygame.draw.line(self.screen, RED, *self.judgment_line, 4)
         
         # Draw notes
-        self.draw_notes()
+        drawn_rects += self.draw_notes()
         
         # Draw UI
-        self.draw_ui()
+        drawn_rects += self.draw_ui()
         
         # Draw judgment
-        self.draw_judgment()
+        drawn_rects += self.draw_judgment()
+        
+        return drawn_rects
     
     def draw_lanes(self):
         """Draw lanes"""
+        highlight_rects = []
         for lane in self.lanes:
-            left_x = lane.get_left_boundary()
-            right_x = lane.get_right_boundary()
-            
             # Lane boundaries
-            pygame.draw.line(self.screen, WHITE, (left_x, 0), (left_x, SCREEN_HEIGHT), 2)
-            pygame.draw.line(self.screen, WHITE, (right_x, 0), (right_x, SCREEN_HEIGHT), 2)
+            pygame.draw.line(self.screen, WHITE, *lane.left_line, 2)
+            pygame.draw.line(self.screen, WHITE, *lane.right_line, 2)
             
             # Highlight if pressed
             if lane.is_pressed:
-                highlight_rect = pygame.Rect(left_x, self.judgment_line_y - 30, 
-                                           lane.width, 60)
-                pygame.draw.rect(self.screen, GRAY, highlight_rect, 0)
+                pygame.draw.rect(self.screen, GRAY, lane.highlight_rect, 0)
+                highlight_rects.append(lane.highlight_rect)
+        return highlight_rects
     
     def draw_notes(self):
         """Draw notes"""
+        screen = self.screen
+        lanes = self.lanes
+        head_min_y = -NOTE_HEIGHT
+        tail_max_y = SCREEN_HEIGHT + NOTE_HEIGHT
+        blit_seq = []
+        drawn_rects = []
         for note in self.notes:
-            # 화면 밖으로 나가도 계속 그리기 (더 넓은 범위)
-            if -500 <= note.y <= SCREEN_HEIGHT + 500:
-                lane = self.lanes[note.lane]
-                note.draw(self.screen, lane)
+            # 화면에 보이는 노트만 그리기 (롱노트는 헤드~테일 전체 범위)
+            top_y = note.get_tail_y() if note.type == NOTE_LONG else note.y
+            if note.y >= head_min_y and top_y <= tail_max_y:
+                note.draw(screen, lanes[note.lane], blit_seq, drawn_rects)
+        drawn_rects += screen.blits(blit_seq)
+        return drawn_rects
     
     def draw_ui(self):
         """Draw UI"""
-        font = pygame.font.Font(None, 36)
-        
-        score_text = font.render(f"Score: {self.score_manager.score}", True, WHITE)
-        self.screen.blit(score_text, (10, 10))
-        
-        combo_text = font.render(f"Combo: {self.score_manager.combo}", True, WHITE)
-        self.screen.blit(combo_text, (10, 50))
-        
-        max_combo_text = font.render(f"Max Combo: {self.score_manager.max_combo}", True, WHITE)
-        self.screen.blit(max_combo_text, (10, 90))
+        # Only re-render text when the value changed
+        if self.score_manager.score != self._score_cache[0]:
+            self._score_cache = (self.score_manager.score,
+                                 self.font_ui.render(f"Score: {self.score_manager.score}", True, WHITE))
+        if self.score_manager.combo != self._combo_cache[0]:
+            self._combo_cache = (self.score_manager.combo,
+                                 self.font_ui.render(f"Combo: {self.score_manager.combo}", True, WHITE))
+        if self.score_manager.max_combo != self._max_combo_cache[0]:
+            self._max_combo_cache = (self.score_manager.max_combo,
+                                     self.font_ui.render(f"Max Combo: {self.score_manager.max_combo}", True, WHITE))
+        
+        # 노트가 지나가며 지워질 수 있으므로 매 프레임 다시 그림
+        return [self.screen.blit(self._score_cache[1], (10, 10)),
+                self.screen.blit(self._combo_cache[1], (10, 50)),
+                self.screen.blit(self._max_combo_cache[1], (10, 90))]
     
     def draw_judgment(self):
         """Draw judgment text"""
         if self.judgment_display.should_display():
-            judgment_font = pygame.font.Font(None, 48)
-            judgment_surface = judgment_font.render(self.judgment_display.text, True, 
-                                                  self.judgment_display.color)
-            judgment_rect = judgment_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
-            self.screen.blit(judgment_surface, judgment_rect)
+            judgment_type = self.judgment_display.last_type
+            return [self.screen.blit(self._judgment_surfs[judgment_type],
+                                     self._judgment_rects[judgment_type])]
+        return []
 
 if __name__ == "__main__":
     game = RhythmGame()